@@ -12,103 +12,385 @@ Drop this file in your Streamlit app folder and run:
     streamlit run afd_visualizer_enhanced.py
 
 Requirements (pip):
-    streamlit
+    streamlit>=1.52
     graphviz
 
 Optional (for rendering PNG export):
     graphviz system package (apt-get install graphviz) if not present
 
+Optional (JIT acceleration of long-string acceptance):
+    numpy
+    numba
+
+Optional (faster JSON export):
+    orjson
+
 """
 
 from __future__ import annotations
 
+import hashlib
+import html
 import json
 import logging
+import shutil
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional, Set
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
 
 import graphviz
 import streamlit as st
 
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # numpy/numba are optional: fall back to the pure-Python walk
+    np = None  # type: ignore[assignment]
+    njit = None  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used for the export instead
+    orjson = None  # type: ignore[assignment]
+
 # ---------------------------
 # Logging
 # ---------------------------
-logging.basicConfig(level=logging.INFO)
+# Handlers/levels are left to the host (Streamlit or the importing code): this module only
+# emits debug records, and Streamlit re-executes the script on every rerun.
 logger = logging.getLogger("AFDVisualizer")
+# Evaluated once at import: the per-symbol debug calls below are skipped entirely unless
+# DEBUG was enabled before this module was (re)imported.
+_DEBUG = logger.isEnabledFor(logging.DEBUG)
+
+
+# ---------------------------
+# JIT kernels (optional)
+# ---------------------------
+# Below this length (of one string, or of a whole batch) the Numba dispatch costs more than the
+# Python loop it replaces.
+_JIT_MIN_LEN = 64
+
+if njit is not None:
+    @njit(cache=True)
+    def _run_dfa(table: np.ndarray, byte_col: np.ndarray, initial: int, buf: np.ndarray) -> int:
+        """Parcourt ``buf`` (uint8) sur ``table[etat, byte_col[octet]]``; -1 si bloqué."""
+        s = initial
+        for i in range(buf.shape[0]):
+            c = byte_col[buf[i]]
+            if c < 0:
+                return -1
+            s = table[s, c]
+            if s < 0:
+                return -1
+        return s
+
+    # Deliberately serial: a parallel=True kernel aborts the process on concurrent calls under
+    # Numba's workqueue threading layer, and Streamlit sessions share AFDs across threads.
+    @njit(cache=True)
+    def _run_dfa_batch(table: np.ndarray, byte_col: np.ndarray, initial: int, buf: np.ndarray,
+                       offsets: np.ndarray, finals: np.ndarray) -> np.ndarray:
+        """Parcourt les segments ``buf[offsets[k]:offsets[k + 1]]``; renvoie un booléen par segment."""
+        out = np.zeros(offsets.shape[0] - 1, dtype=np.bool_)
+        for k in range(out.shape[0]):
+            s = initial
+            for i in range(offsets[k], offsets[k + 1]):
+                c = byte_col[buf[i]]
+                s = table[s, c] if c >= 0 else -1
+                if s < 0:
+                    break
+            out[k] = s >= 0 and finals[s]
+        return out
+else:
+    _run_dfa = None
+    _run_dfa_batch = None
 
 
 # ---------------------------
 # AFD core implementation
 # ---------------------------
-@dataclass
+def _derive() -> Any:
+    """Champ calculé dans __post_init__ (hors __init__, repr et comparaison)."""
+    return field(init=False, repr=False, compare=False)
+
+
+@dataclass(slots=True)
 class AFD:
-    alphabet: Set[str]
-    etats: Set[str]
+    """Automate fini déterministe.
+
+    Configuration immuable: les parcours (accepter_chaine, simuler, ...) gardent
+    l'état courant dans une variable locale et peuvent tourner en parallèle sur
+    une même instance. Pour avancer symbole par symbole, utiliser curseur().
+    """
+
+    alphabet: FrozenSet[str]
+    etats: FrozenSet[str]
     etat_initial: str
-    etats_finaux: Set[str]
-    transitions: Dict[str, Dict[str, str]]
-    etat_actuel: str = field(init=False)
+    etats_finaux: FrozenSet[str]
+    transitions: Mapping[str, Mapping[str, str]]
+
+    # derived lookup structures (see _compiler_table)
+    _state_idx: Dict[str, int] = _derive()
+    _sym_idx: Dict[str, int] = _derive()
+    _alphabet_sorted: Tuple[str, ...] = _derive()
+    _etats_sorted: Tuple[str, ...] = _derive()  # also the state index -> name map
+    _finaux_sorted: Tuple[str, ...] = _derive()
+    _rows: List[Dict[str, int]] = _derive()
+    _accept_rows: List[Dict[str, int]] = _derive()
+    _flat: Dict[Tuple[str, str], str] = _derive()
+    _grouped_edges: Tuple[Tuple[Tuple[str, str], Tuple[str, ...]], ...] = _derive()
+    _serializable: Dict[str, Any] = _derive()
+    _initial: int = _derive()
+    _final_bits: int = _derive()
+    _alphabet_bytes: Optional[bytes] = _derive()
+    _alphabet_tt: Optional[Dict[int, Optional[int]]] = _derive()
+    _jit: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = _derive()  # (table, byte_col, finals)
+    _sig: int = _derive()
+    _fingerprint: str = _derive()
 
     def __post_init__(self) -> None:
+        # callers may pass plain sets/dicts: freeze them so the tables built below cannot go stale
+        self.alphabet = frozenset(self.alphabet)
+        self.etats = frozenset(self.etats)
+        self.etats_finaux = frozenset(self.etats_finaux)
+        self.transitions = figer_transitions(self.transitions)
         if self.etat_initial not in self.etats:
             raise ValueError("etat_initial must be an element of etats")
         for e in self.etats_finaux:
             if e not in self.etats:
                 raise ValueError("all etats_finaux must be in etats")
-        self.reinitialiser()
+        self._compiler_table()
+        self._sig = hash((self.alphabet, self.etats, self.etat_initial, self.etats_finaux,
+                          frozenset(self._flat.items())))
+        # canonical (order-independent, process-independent) digest, unlike hash() of str
+        self._fingerprint = hashlib.blake2b(
+            repr((self._alphabet_sorted, self._etats_sorted, self.etat_initial, self._finaux_sorted,
+                  sorted(self._flat.items()))).encode(),
+            digest_size=16).hexdigest()
+
+    def __hash__(self) -> int:
+        # structural signature, computed once (fields are frozenset/MappingProxyType)
+        return self._sig
+
+    def fingerprint(self) -> str:
+        """Empreinte structurelle (hex) de l'AFD.
+
+        Two AFDs with the same states, alphabet, initial/final states and transitions get the same
+        fingerprint, in every session and process: it keys the shared render caches.
+        """
+        return self._fingerprint
 
-    def reinitialiser(self) -> None:
-        """Réinitialise l'automate à l'état initial."""
-        self.etat_actuel = self.etat_initial
-        logger.debug("Réinitialisation -> %s", self.etat_actuel)
+    def _compiler_table(self) -> None:
+        """Construit les structures de parcours à partir d'une table de transitions dense (row-major).
 
-    def traiter_symbole(self, symbole: str) -> bool:
-        """Traite un symbole et effectue la transition si possible.
-
-        Returns True if transition succeeded, False otherwise.
+        Les états et symboles sont numérotés dans l'ordre trié; une case à -1
+        signifie qu'il n'existe pas de transition. La table elle-même n'est pas
+        conservée: seules les lignes (_rows, _accept_rows) et la table JIT le sont.
         """
-        if symbole not in self.alphabet:
-            logger.debug("Symbole invalide: %s", symbole)
-            return False
-
-        trans = self.transitions.get(self.etat_actuel, {})
-        if symbole in trans:
-            self.etat_actuel = trans[symbole]
-            logger.debug("Transition: %s --%s--> %s", trans, symbole, self.etat_actuel)
-            return True
+        self._alphabet_sorted = tuple(sorted(self.alphabet))
+        self._etats_sorted = tuple(sorted(self.etats))
+        self._finaux_sorted = tuple(sorted(self.etats_finaux))
+        self._state_idx = {e: i for i, e in enumerate(self._etats_sorted)}
+        self._sym_idx = {s: i for i, s in enumerate(self._alphabet_sorted)}
+        table = [[-1] * len(self._sym_idx) for _ in self._etats_sorted]
+        for src, trans in self.transitions.items():
+            for sym, dst in trans.items():
+                if src not in self._state_idx or dst not in self._state_idx or sym not in self._sym_idx:
+                    raise ValueError("transitions must only use etats and alphabet symbols")
+                table[self._state_idx[src]][self._sym_idx[sym]] = self._state_idx[dst]
+        # per-state symbole -> etat dicts: the pure-Python walks do one .get per symbol
+        self._rows = [{sym: dst for sym, dst in zip(self._alphabet_sorted, row) if dst >= 0} for row in table]
+        # (etat, symbole) -> etat: single-probe lookup for the string-state stepping API
+        self._flat = {(src, sym): dst for src, trans in self.transitions.items() for sym, dst in trans.items()}
+
+        # Live states: those from which a final state is still reachable (reverse BFS from etats_finaux).
+        # Acceptance walks drop every transition into a dead state, so they stop as soon as the input
+        # falls into a trap instead of scanning the rest of it; path walks keep the full rows.
+        pred = defaultdict(set)
+        for (src, _), dst in self._flat.items():
+            pred[dst].add(src)
+        live = set(self.etats_finaux)
+        pile = list(live)
+        while pile:
+            for src in pred[pile.pop()]:
+                if src not in live:
+                    live.add(src)
+                    pile.append(src)
+        live_ids = {self._state_idx[e] for e in live}
+        accept_table = [[dst if dst in live_ids else -1 for dst in row] for row in table]
+        self._accept_rows = [{sym: dst for sym, dst in row.items() if dst in live_ids} for row in self._rows]
+        # ((src, dst), sorted symbols) pairs, for the graph labels; already in cache-key form
+        grouped = defaultdict(list)
+        for (src, sym), dst in self._flat.items():
+            grouped[(src, dst)].append(sym)
+        self._grouped_edges = tuple((k, tuple(sorted(v))) for k, v in sorted(grouped.items()))
+        self._initial = self._state_idx[self.etat_initial]
+        self._serializable = {
+            "alphabet": self._alphabet_sorted,
+            "etats": self._etats_sorted,
+            "etat_initial": self.etat_initial,
+            "etats_finaux": self._finaux_sorted,
+            "transitions": {src: dict(trans) for src, trans in self.transitions.items()},
+        }
+        # bit i set iff state i is final: finality is a shift + AND instead of a set probe
+        self._final_bits = 0
+        for f in self.etats_finaux:
+            self._final_bits |= 1 << self._state_idx[f]
+
+        # Byte-level fast paths, only when every symbol is a single latin-1 character
+        latin1 = all(len(s) == 1 and ord(s) < 256 for s in self._sym_idx)
+        self._alphabet_bytes = "".join(self._sym_idx).encode("latin-1") if latin1 else None
+        # any other single-character alphabet: str.translate table deleting the alphabet
+        single = all(len(s) == 1 for s in self._sym_idx)
+        self._alphabet_tt = str.maketrans("", "", "".join(self._sym_idx)) if single and not latin1 else None
+
+        # JIT path: compact int32 [num_states, num_symbols] table plus a 256-entry byte -> column map
+        self._jit = None
+        if _run_dfa is not None and latin1:
+            n = len(self._etats_sorted)
+            table_np = np.asarray(accept_table, dtype=np.int32).reshape(n, len(self._sym_idx))
+            byte_col = np.full(256, -1, dtype=np.int32)
+            for s, col in self._sym_idx.items():
+                byte_col[ord(s)] = col
+            finals_np = np.zeros(n, dtype=np.bool_)
+            finals_np[[self._state_idx[f] for f in self.etats_finaux]] = True
+            self._jit = (table_np, byte_col, finals_np)
+
+    def exporter_json(self) -> bytes:
+        """Sérialise l'AFD au format attendu par parse_afd_from_json (UTF-8, indenté)."""
+        if orjson is not None:
+            return orjson.dumps(self._serializable, option=orjson.OPT_INDENT_2)
+        return json.dumps(self._serializable, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def valider_chaine(self, chaine: str) -> bool:
+        """Retourne True si tous les symboles de la chaîne appartiennent à l'alphabet."""
+        if self._alphabet_bytes is not None:
+            try:
+                # delete every alphabet byte in C; anything left over is invalid
+                return not chaine.encode("latin-1").translate(None, self._alphabet_bytes)
+            except UnicodeEncodeError:
+                return False
+        if self._alphabet_tt is not None:
+            return not chaine.translate(self._alphabet_tt)
+        return set(chaine) <= self.alphabet
 
-        logger.debug("Aucune transition depuis %s sur '%s'", self.etat_actuel, symbole)
-        return False
+    def curseur(self) -> CurseurAFD:
+        """Retourne un curseur pas à pas, positionné sur l'état initial."""
+        return CurseurAFD(self)
 
     def accepter_chaine(self, chaine: Iterable[str]) -> bool:
         """Retourne True si la chaîne est acceptée par l'automate."""
-        self.reinitialiser()
+        if self._jit is not None and isinstance(chaine, str) and len(chaine) >= _JIT_MIN_LEN:
+            try:
+                buf = np.frombuffer(chaine.encode("latin-1"), dtype=np.uint8)
+            except UnicodeEncodeError:
+                return False
+            etat = _run_dfa(self._jit[0], self._jit[1], self._initial, buf)
+            return etat >= 0 and bool((self._final_bits >> etat) & 1)
+
+        rows = self._accept_rows
+        etat = self._initial
         for s in chaine:
-            if not self.traiter_symbole(s):
+            nxt = rows[etat].get(s)
+            if nxt is None:
                 return False
-        return self.etat_actuel in self.etats_finaux
+            etat = nxt
+        return bool((self._final_bits >> etat) & 1)
+
+    def accepter_chaines(self, chaines: Iterable[str]) -> List[bool]:
+        """Teste plusieurs chaînes d'un coup (un seul appel au kernel JIT pour les lots assez longs)."""
+        chaines = list(chaines)
+        if (self._jit is not None and all(isinstance(c, str) for c in chaines)
+                and sum(map(len, chaines)) >= _JIT_MIN_LEN):
+            try:
+                encodees = [c.encode("latin-1") for c in chaines]
+            except UnicodeEncodeError:
+                pass
+            else:
+                offsets = np.zeros(len(encodees) + 1, dtype=np.int64)
+                np.cumsum([len(e) for e in encodees], out=offsets[1:])
+                buf = np.frombuffer(b"".join(encodees), dtype=np.uint8)
+                table_np, byte_col, finals_np = self._jit
+                return _run_dfa_batch(table_np, byte_col, self._initial, buf, offsets, finals_np).tolist()
+        return [self.accepter_chaine(c) for c in chaines]
+
+    def simuler(self, chaine: str) -> Tuple[Tuple[str, ...], bool]:
+        """Retourne (chemin, acceptée) en un seul parcours.
+
+        Not memoized: the UI only simulates on a button click and keeps the result in session_state.
+        """
+        return self._parcourir(chaine)
+
+    def _parcourir(self, chaine: Iterable[str]) -> Tuple[Tuple[str, ...], bool]:
+        """Parcours unique partagé par simuler et obtenir_chemin: (chemin, acceptée)."""
+        rows, inv = self._rows, self._etats_sorted
+        etat = self._initial
+        chemin = [inv[etat]]
+        append = chemin.append
+        for s in chaine:
+            nxt = rows[etat].get(s)
+            if nxt is None:
+                # stop at first invalid transition
+                return tuple(chemin), False
+            etat = nxt
+            append(inv[etat])
+        return tuple(chemin), bool((self._final_bits >> etat) & 1)
 
     def obtenir_chemin(self, chaine: Iterable[str]) -> List[str]:
+        return list(self._parcourir(chaine)[0])
+
+
+@dataclass(slots=True)
+class CurseurAFD:
+    """Exécution pas à pas d'un AFD.
+
+    L'état courant vit ici et non dans l'AFD, qui reste une configuration
+    immuable partageable entre sessions et threads.
+    """
+    afd: AFD
+    etat_actuel: str = field(init=False)
+
+    def __post_init__(self) -> None:
         self.reinitialiser()
-        chemin = [self.etat_actuel]
-        for s in chaine:
-            if self.traiter_symbole(s):
-                chemin.append(self.etat_actuel)
+
+    def reinitialiser(self) -> None:
+        """Réinitialise l'automate à l'état initial."""
+        self.etat_actuel = self.afd.etat_initial
+        if _DEBUG:
+            logger.debug("Réinitialisation -> %s", self.etat_actuel)
+
+    def traiter_symbole(self, symbole: str) -> bool:
+        """Traite un symbole et effectue la transition si possible.
+
+        Returns True if transition succeeded, False otherwise.
+        """
+        dst = self.afd._flat.get((self.etat_actuel, symbole))
+        if dst is not None:
+            if _DEBUG:
+                logger.debug("Transition: %s --%s--> %s", self.etat_actuel, symbole, dst)
+            self.etat_actuel = dst
+            return True
+
+        if _DEBUG:
+            if symbole not in self.afd._sym_idx:
+                logger.debug("Symbole invalide: %s", symbole)
             else:
-                # stop at first invalid transition
-                break
-        return chemin
+                logger.debug("Aucune transition depuis %s sur '%s'", self.etat_actuel, symbole)
+        return False
 
 
 # ---------------------------
 # Utilities
 # ---------------------------
 
+@st.cache_resource(show_spinner=False)
 def creer_afd_exemple() -> AFD:
-    alphabet = {"a", "b"}
-    etats = {"q0", "q1", "q2"}
+    alphabet = frozenset({"a", "b"})
+    etats = frozenset({"q0", "q1", "q2"})
     etat_initial = "q0"
-    etats_finaux = {"q2"}
+    etats_finaux = frozenset({"q2"})
     transitions = {
         "q0": {"a": "q1", "b": "q0"},
         "q1": {"a": "q1", "b": "q2"},
@@ -117,41 +399,96 @@ def creer_afd_exemple() -> AFD:
     return AFD(alphabet, etats, etat_initial, etats_finaux, transitions)
 
 
-def afd_to_graphviz(afd: AFD, highlight_path: Optional[List[str]] = None) -> graphviz.Digraph:
-    """Crée un Graphviz Digraph représentant l'AFD.
+def figer_transitions(transitions: Mapping[str, Mapping[str, str]]) -> Mapping[str, Mapping[str, str]]:
+    """Copie les transitions dans des MappingProxyType en lecture seule."""
+    return MappingProxyType({src: MappingProxyType(dict(trans)) for src, trans in transitions.items()})
+
+
+# Bound for the DOT/PNG render caches (one entry per distinct AFD + highlighted-state set).
+_RENDER_CACHE_SIZE = 256
+
+
+def afd_to_graphviz(afd: AFD, highlight_path: Optional[List[str]] = None) -> graphviz.Source:
+    """Crée un graphviz.Source (DOT) représentant l'AFD.
 
     highlight_path: optional list of states to highlight (in order)
     """
-    dot = graphviz.Digraph(format="png")
-    dot.attr(rankdir="LR", size="8,5")
+    return graphviz.Source(_dot_source(afd, _dot_key(afd, highlight_path)[1]), format="png")
+
+
+def _dot_key(afd: AFD, highlight_path: Optional[List[str]] = None) -> Tuple[str, Tuple[str, ...]]:
+    """Clé des caches de rendu: (empreinte de l'AFD, états surlignés).
+
+    Only the set of highlighted states changes the drawing, so the path is reduced to its
+    sorted distinct states: "ab" and "abab" share one cache entry.
+    """
+    return afd.fingerprint(), tuple(sorted(set(highlight_path or ())))
+
+
+def _dot_id(nom: str) -> str:
+    """Identifiant DOT entre guillemets (\\ et " échappés)."""
+    return '"' + nom.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+# DOT node attributes, indexed by (final, highlighted)
+_NODE_ATTRS = {
+    (False, False): '[shape=circle style=""]',
+    (False, True): "[shape=circle style=filled]",
+    (True, False): '[shape=doublecircle style=""]',
+    (True, True): "[shape=doublecircle style=filled]",
+}
+
 
-    # invisible start arrow
-    dot.node("__start__", label="", shape="none")
-    dot.edge("__start__", afd.etat_initial, arrowhead="normal")
+def _dot_source(afd: AFD, highlight_path: Tuple[str, ...]) -> str:
+    """Écrit la source DOT directement (une ligne par nœud/arête, un seul join).
+
+    Bypasses graphviz.Digraph, which re-quotes every attribute on each node()/edge() call.
+    """
+    lines = ["digraph {", '\trankdir=LR size="8,5"',
+             # invisible start arrow
+             '\t__start__ [label="" shape=none]',
+             f"\t__start__ -> {_dot_id(afd.etat_initial)} [arrowhead=normal]"]
 
     # nodes
-    for etat in sorted(afd.etats):
-        if etat in afd.etats_finaux:
-            dot.node(etat, shape="doublecircle", style="filled" if highlight_path and etat in highlight_path else "")
-        else:
-            dot.node(etat, shape="circle", style="filled" if highlight_path and etat in highlight_path else "")
+    finaux, surlignes = afd.etats_finaux, frozenset(highlight_path)
+    lines.extend(f"\t{_dot_id(etat)} {_NODE_ATTRS[etat in finaux, etat in surlignes]}"
+                 for etat in afd._etats_sorted)
+
+    # transitions (already grouped per (src, dst) for nicer labels)
+    lines.extend(f"\t{_dot_id(src)} -> {_dot_id(dst)} [label={_dot_id(','.join(syms))}]"
+                 for (src, dst), syms in afd._grouped_edges)
+
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+# Render caches are cache_resource, shared by every session: equivalent AFDs uploaded by different
+# users hit the same entries. Arguments prefixed with "_" are not hashed by Streamlit, so the key is
+# only (fingerprint, highlighted states).
+@st.cache_resource(show_spinner=False, max_entries=_RENDER_CACHE_SIZE)
+def _build_dot_source(fingerprint: str, highlight_path: Tuple[str, ...], _afd: AFD) -> str:
+    """Source DOT mémoïsée: les reruns Streamlit ne reconstruisent pas le graphe."""
+    return _dot_source(_afd, highlight_path)
 
-    # transitions (group same edges for nicer labels)
-    edges: Dict[(str, str), List[str]] = {}
-    for src, trans in afd.transitions.items():
-        for sym, dst in trans.items():
-            edges.setdefault((src, dst), []).append(sym)
 
-    for (src, dst), syms in edges.items():
-        label = ",".join(sorted(syms))
-        dot.edge(src, dst, label=label)
+@st.cache_resource(show_spinner=False)
+def _has_graphviz() -> bool:
+    """True si le binaire `dot` de Graphviz est dans le PATH (vérifié une fois par processus)."""
+    return shutil.which("dot") is not None
 
-    return dot
 
+@st.cache_resource(show_spinner=False, max_entries=_RENDER_CACHE_SIZE)
+def _render_png(fingerprint: str, highlight_path: Tuple[str, ...], _source: str) -> bytes:
+    """Rendu PNG mémoïsé: le binaire `dot` n'est lancé qu'une fois par AFD et chemin surligné."""
+    return graphviz.Source(_source).pipe(format="png")
 
+
+@st.cache_resource(show_spinner=False, max_entries=64)
 def parse_afd_from_json(text: str) -> AFD:
     """Charge un AFD depuis une JSON string.
 
+    Memoized on the text: re-uploading the same file reuses the AFD (immutable, so safe to share).
+
     JSON schema expected:
     {
       "alphabet": ["a","b"],
@@ -162,20 +499,39 @@ def parse_afd_from_json(text: str) -> AFD:
     }
     """
     obj = json.loads(text)
-    return AFD(set(obj["alphabet"]), set(obj["etats"]), obj["etat_initial"], set(obj["etats_finaux"]),
-               obj["transitions"])
+    return AFD(frozenset(obj["alphabet"]), frozenset(obj["etats"]), obj["etat_initial"],
+               frozenset(obj["etats_finaux"]), obj["transitions"])
+
+
+def _autoplay_html(chemin: List[str], vitesse: float) -> str:
+    """Animation autonome du chemin en CSS pur (keyframes décalées, aucun sleep côté serveur).
+
+    Chaque état est un <span> superposé, visible pendant sa seule tranche de
+    ``vitesse`` secondes; le message final reste affiché à la fin.
+    """
+    etapes = "".join(
+        f"<span style='animation: afd-step {vitesse:.2f}s linear {i * vitesse:.2f}s 1'>"
+        f"<b>État courant:</b> <code>{html.escape(etat)}</code></span>"
+        for i, etat in enumerate(chemin)
+    )
+    fin = (f"<span style='animation: afd-step 1s linear {len(chemin) * vitesse:.2f}s 1 forwards'>"
+           "✅ Animation terminée</span>")
+    return f"""
+    <style>
+    #afd-autoplay {{ position: relative; height: 1.8em; font-family: 'Segoe UI', Roboto, Arial, sans-serif; font-size: 16px }}
+    #afd-autoplay span {{ position: absolute; left: 0; top: 0; visibility: hidden }}
+    @keyframes afd-step {{ from {{ visibility: visible }} to {{ visibility: visible }} }}
+    </style>
+    <div id="afd-autoplay">{etapes}{fin}</div>
+    """
 
 
 # ---------------------------
 # Streamlit UI
 # ---------------------------
 
-# Page setup
-st.set_page_config(page_title="AFD Visualizer — Professional", page_icon="🔠", layout="wide")
-
-# Custom CSS (polished, minimal)
-st.markdown(
-    """
+# Static markup, kept as module constants so the script body only references them
+_CSS = """
     <style>
     /* Container */
     .stApp { font-family: 'Segoe UI', Roboto, Arial, sans-serif; }
@@ -192,13 +548,19 @@ st.markdown(
     .state-pill { padding:6px 10px; border-radius:999px; background:#f1f3f5; display:inline-block; margin-right:6px }
 
     </style>
-    """,
-    unsafe_allow_html=True,
-)
+"""
+
+_TITLE_HTML = "<div class='title'>🔠 AFD Visualizer — Professional</div>"
+_SUBTITLE_HTML = "<div class='subtitle'>Interactive, clean and production-ready automaton visualizer</div>"
+
+# Page setup
+st.set_page_config(page_title="AFD Visualizer — Professional", page_icon="🔠", layout="wide")
 
-st.markdown("<div class='title'>🔠 AFD Visualizer — Professional</div>", unsafe_allow_html=True)
-st.markdown("<div class='subtitle'>Interactive, clean and production-ready automaton visualizer</div>",
-            unsafe_allow_html=True)
+# Custom CSS (polished, minimal)
+st.markdown(_CSS, unsafe_allow_html=True)
+
+st.markdown(_TITLE_HTML, unsafe_allow_html=True)
+st.markdown(_SUBTITLE_HTML, unsafe_allow_html=True)
 st.write("---")
 
 # Sidebar: choose or upload AFD
@@ -206,26 +568,36 @@ with st.sidebar:
     st.header("Configuration AFD")
     mode = st.radio("Mode:", ["Example AFD", "Upload JSON"], index=0)
 
-    if mode == "Example AFD":
-        afd = creer_afd_exemple()
-    else:
+    uploaded = None
+    if mode == "Upload JSON":
         uploaded = st.file_uploader("Upload AFD JSON file", type=["json"])
-        if uploaded is not None:
+        if uploaded is None:
+            st.info("Upload a JSON file or select 'Example AFD' to continue.")
+            st.stop()
+
+    # The AFD is kept in session_state and only rebuilt when its source (mode / uploaded file)
+    # changes: other reruns skip decoding and hashing the uploaded text.
+    source_afd = mode if uploaded is None else uploaded.file_id
+    if st.session_state.get("afd_source") != source_afd:
+        if uploaded is None:
+            st.session_state["afd"] = creer_afd_exemple()
+        else:
             try:
-                afd = parse_afd_from_json(uploaded.read().decode("utf-8"))
+                st.session_state["afd"] = parse_afd_from_json(uploaded.getvalue().decode("utf-8"))
             except Exception as e:
                 st.error(f"Erreur lors du parsing du JSON: {e}")
                 st.stop()
-        else:
-            st.info("Upload a JSON file or select 'Example AFD' to continue.")
-            st.stop()
+        st.session_state["afd_source"] = source_afd
+        # a path simulated on the previous AFD means nothing on the new one
+        st.session_state.pop("last_chemin", None)
+    afd: AFD = st.session_state["afd"]
 
     st.markdown("**Alphabet:**")
-    st.write(", ".join(sorted(afd.alphabet)))
+    st.write(", ".join(afd._alphabet_sorted))
     st.markdown("**États:**")
-    st.write(", ".join(sorted(afd.etats)))
+    st.write(", ".join(afd._etats_sorted))
     st.markdown(f"**État initial:** `{afd.etat_initial}`")
-    st.markdown(f"**États finaux:** {', '.join(sorted(afd.etats_finaux))}")
+    st.markdown(f"**États finaux:** {', '.join(afd._finaux_sorted)}")
     st.markdown("---")
 
 # Main layout: left = controls, right = visualization
@@ -245,15 +617,14 @@ with col1:
     if st.button("▶️ Lancer la simulation", key="run_sim"):
         if not chaine:
             st.warning("Entrez une chaîne valide.")
-        elif any(c not in afd.alphabet for c in chaine):
+        elif not afd.valider_chaine(chaine):
             st.error("La chaîne contient des symboles hors alphabet de l'AFD.")
         else:
             # store chemin in session_state for animation controls
-            chemin = afd.obtenir_chemin(chaine)
+            chemin, accepted = afd.simuler(chaine)
             st.session_state["last_chaine"] = chaine
-            st.session_state["last_chemin"] = chemin
+            st.session_state["last_chemin"] = list(chemin)
 
-            accepted = afd.accepter_chaine(chaine)
             if accepted:
                 st.success(f"✅ La chaîne '{chaine}' est ACCEPTÉE")
             else:
@@ -270,49 +641,38 @@ with col1:
         if step_mode == "Pas à pas":
             idx = st.number_input("Étape", min_value=0, max_value=len(chemin) - 1, value=0, step=1)
             st.markdown(f"État courant: **{chemin[idx]}**")
-        else:
-            # autoplay: show sequence with st.empty and time.sleep
-            placeholder = st.empty()
-            import time
-
-            for state in chemin:
-                placeholder.markdown(f"**État courant:** `{state}`")
-                time.sleep(autoplay_speed)
-
-            placeholder.success("Animation terminée")
+        elif autoplay_speed is not None:
+            # autoplay runs in the browser: the script renders the sequence once and moves on
+            st.html(_autoplay_html(chemin, autoplay_speed))
 
     st.markdown("---")
     st.header("📥 Export & Diagnostics")
     if st.button("Télécharger les transitions (JSON)"):
-        blob = json.dumps({
-            "alphabet": sorted(list(afd.alphabet)),
-            "etats": sorted(list(afd.etats)),
-            "etat_initial": afd.etat_initial,
-            "etats_finaux": sorted(list(afd.etats_finaux)),
-            "transitions": afd.transitions,
-        }, ensure_ascii=False, indent=2)
-        st.download_button("Télécharger JSON", blob, file_name="afd_transitions.json")
+        st.download_button("Télécharger JSON", afd.exporter_json(), file_name="afd_transitions.json",
+                           mime="application/json")
 
 with col2:
     st.header("📊 Visualisation et Export PNG")
 
     # highlight path if exists
     highlight_path = st.session_state.get("last_chemin") if st.session_state.get("last_chemin") else None
-    dot = afd_to_graphviz(afd, highlight_path=highlight_path)
+    render_key = _dot_key(afd, highlight_path)
+    source = _build_dot_source(*render_key, afd)
 
-    st.graphviz_chart(dot)
+    st.graphviz_chart(source)
 
     # show legend and details
     st.markdown("**Légende / Info**")
     st.markdown("- Cercle double = état final")
 
-    # PNG export
-    try:
-        png_bytes = dot.pipe(format="png")
-        st.download_button("📸 Télécharger le diagramme (PNG)", png_bytes, file_name="afd_diagram.png")
-    except Exception as e:
-        st.info("Export PNG indisponible (Graphviz binaire manquant). Vous pouvez quand même visualiser le graphe.")
-        logger.debug("graphviz export error: %s", e)
+    # PNG export: availability comes from a PATH lookup; `data` is a callable, so the `dot`
+    # subprocess only runs when the user clicks the download button
+    if _has_graphviz():
+        st.download_button("📸 Télécharger le diagramme (PNG)", data=partial(_render_png, *render_key, source),
+                           file_name="afd_diagram.png", mime="image/png")
+    else:
+        st.info("Export PNG indisponible (Graphviz binaire manquant). "
+                "Vous pouvez quand même visualiser le graphe.")
 
 # Footer: tips
 st.write("---")